@@ -5,63 +5,190 @@ Handles loading and validation of configuration files
 """
 
 import os
-import yaml
+import copy
+import hashlib
+import logging
 import json
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# PyYAML is imported on first use; see _get_yaml()
+_yaml = None
+_YAML_LOADER = None
+_YAML_DUMPER = None
+
+# Defaults for sections missing from both YAML and environment
+_DEFAULTS = MappingProxyType({
+    'trading_pair': {
+        'symbol': 'BTCUSDT',
+        'base_currency': 'BTC',
+        'quote_currency': 'USDT'
+    },
+    'position_size': {
+        'type': 'fixed',  # 'fixed' or 'percentage'
+        'value': 10.0,    # USD amount or percentage
+        'max_position': 100.0
+    },
+    'leverage': {
+        'value': 1,
+        'max_leverage': 10
+    },
+    'risk_management': {
+        'stop_loss': 2.0,      # percentage
+        'take_profit': 5.0,    # percentage
+        'max_daily_loss': 10.0, # percentage
+        'max_open_positions': 3
+    },
+    'trading_hours': {
+        'enabled': False,
+        'start': '09:00',
+        'end': '17:00',
+        'timezone': 'UTC'
+    },
+    'watchdog': {
+        'enabled': True,
+        'heartbeat_interval': 30,  # seconds
+        'max_failures': 3,
+        'auto_restart': True
+    },
+    'notifications': {
+        'enabled': False,
+        'telegram_bot_token': '',
+        'telegram_chat_id': '',
+        'email_enabled': False,
+        'email_smtp_server': '',
+        'email_username': '',
+        'email_password': ''
+    }
+})
+
+# Merged configs keyed by (path, mtime_ns, size) of the YAML file
+_CONFIG_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+# Merged configs keyed by (path, content hash), for when only the mtime changed
+_CONTENT_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+def _get_yaml():
+    """Import PyYAML and resolve the fastest safe loader/dumper once"""
+    global _yaml, _YAML_LOADER, _YAML_DUMPER
+    if _yaml is None:
+        import yaml
+        # Prefer the LibYAML bindings; the pure-Python loader is roughly 10x slower
+        _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        _YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        if _YAML_LOADER is yaml.SafeLoader:
+            logger.warning("LibYAML not available, falling back to pure-Python YAML parser")
+        _yaml = yaml
+    return _yaml
+
 def load_yaml_config(file_path: str = "config.yaml") -> Dict[str, Any]:
     """Load configuration from YAML file"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        return config or {}
+            content = f.read()
     except FileNotFoundError:
-        print(f"⚠️ Config file not found: {file_path}")
+        logger.warning("Config file not found: %s", file_path)
         return {}
+    except Exception:
+        logger.exception("Error loading config")
+        return {}
+    
+    yaml = _get_yaml()
+    try:
+        config = yaml.load(content, Loader=_YAML_LOADER)
+        return config or {}
     except yaml.YAMLError as e:
-        print(f"❌ Error parsing config file: {e}")
+        logger.error("Error parsing config file: %s", e)
         return {}
-    except Exception as e:
-        print(f"❌ Error loading config: {e}")
+    except Exception:
+        logger.exception("Error loading config")
         return {}
 
+def _int(env, key: str, default: int) -> int:
+    """Read an integer setting from an environment mapping"""
+    value = env.get(key)
+    return int(value) if value is not None else default
+
 def load_env_config() -> Dict[str, Any]:
     """Load configuration from environment variables"""
+    env = os.environ
     config = {}
     
     # API Configuration
     config['api'] = {
-        'key': os.getenv('PIONEX_API_KEY', ''),
-        'secret': os.getenv('PIONEX_SECRET_KEY', ''),
-        'base_url': os.getenv('PIONEX_BASE_URL', 'https://api.pionex.com')
+        'key': env.get('PIONEX_API_KEY', ''),
+        'secret': env.get('PIONEX_SECRET_KEY', ''),
+        'base_url': env.get('PIONEX_BASE_URL', 'https://api.pionex.com')
     }
     
     # Database Configuration
     config['database'] = {
-        'url': os.getenv('DATABASE_URL', 'sqlite:///trading_bot.db'),
-        'type': os.getenv('DATABASE_TYPE', 'sqlite')
+        'url': env.get('DATABASE_URL', 'sqlite:///trading_bot.db'),
+        'type': env.get('DATABASE_TYPE', 'sqlite')
     }
     
     # GUI Configuration
     config['gui'] = {
-        'host': os.getenv('GUI_HOST', '127.0.0.1'),
-        'port': int(os.getenv('GUI_PORT', 5000)),
-        'debug': os.getenv('GUI_DEBUG', 'false').lower() == 'true'
+        'host': env.get('GUI_HOST', '127.0.0.1'),
+        'port': _int(env, 'GUI_PORT', 5000),
+        'debug': env.get('GUI_DEBUG', 'false').lower() == 'true'
     }
     
     # Logging Configuration
     config['logging'] = {
-        'level': os.getenv('LOG_LEVEL', 'INFO'),
-        'file': os.getenv('LOG_FILE', 'logs/trading_bot.log'),
-        'max_size': int(os.getenv('LOG_MAX_SIZE', 10 * 1024 * 1024)),  # 10MB
-        'backup_count': int(os.getenv('LOG_BACKUP_COUNT', 5))
+        'level': env.get('LOG_LEVEL', 'INFO'),
+        'file': env.get('LOG_FILE', 'logs/trading_bot.log'),
+        'max_size': _int(env, 'LOG_MAX_SIZE', 10 * 1024 * 1024),  # 10MB
+        'backup_count': _int(env, 'LOG_BACKUP_COUNT', 5)
     }
     
     return config
 
+def invalidate_config_cache():
+    """Drop all cached configurations"""
+    _CONFIG_CACHE.clear()
+    _CONTENT_CACHE.clear()
+
+def _config_cache_key(file_path: str) -> tuple:
+    """Build cache key from the config file's path, mtime and size"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return (file_path, None, None)
+    return (file_path, st.st_mtime_ns, st.st_size)
+
+def _fingerprint(file_path: str) -> Optional[bytes]:
+    """Hash the config file's contents, or None if it can't be read"""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if blake3 is not None:
+        return blake3.blake3(data).digest()
+    return hashlib.blake2b(data).digest()
+
 def get_config(file_path: str = "config.yaml") -> Dict[str, Any]:
     """Get merged configuration from YAML and environment"""
+    key = _config_cache_key(file_path)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is None:
+        # mtime/size changed; reuse the parsed config if the contents didn't
+        content_key = (file_path, _fingerprint(file_path))
+        cached = _CONTENT_CACHE.get(content_key)
+        if cached is not None:
+            _CONFIG_CACHE[key] = cached
+    if cached is not None:
+        # Hand out a copy so callers can't mutate the cached config
+        return copy.deepcopy(cached)
     
     # Load YAML config
     yaml_config = load_yaml_config(file_path)
@@ -82,68 +209,25 @@ def get_config(file_path: str = "config.yaml") -> Dict[str, Any]:
         config[section].update(values)
     
     # Set defaults for missing sections
-    config.setdefault('trading_pair', {
-        'symbol': 'BTCUSDT',
-        'base_currency': 'BTC',
-        'quote_currency': 'USDT'
-    })
-    
-    config.setdefault('position_size', {
-        'type': 'fixed',  # 'fixed' or 'percentage'
-        'value': 10.0,    # USD amount or percentage
-        'max_position': 100.0
-    })
-    
-    config.setdefault('leverage', {
-        'value': 1,
-        'max_leverage': 10
-    })
-    
-    config.setdefault('risk_management', {
-        'stop_loss': 2.0,      # percentage
-        'take_profit': 5.0,    # percentage
-        'max_daily_loss': 10.0, # percentage
-        'max_open_positions': 3
-    })
-    
-    config.setdefault('trading_hours', {
-        'enabled': False,
-        'start': '09:00',
-        'end': '17:00',
-        'timezone': 'UTC'
-    })
-    
-    config.setdefault('watchdog', {
-        'enabled': True,
-        'heartbeat_interval': 30,  # seconds
-        'max_failures': 3,
-        'auto_restart': True
-    })
-    
-    config.setdefault('notifications', {
-        'enabled': False,
-        'telegram_bot_token': '',
-        'telegram_chat_id': '',
-        'email_enabled': False,
-        'email_smtp_server': '',
-        'email_username': '',
-        'email_password': ''
-    })
+    for section, values in _DEFAULTS.items():
+        if section not in config:
+            config[section] = copy.deepcopy(values)
     
-    return config
+    _CONFIG_CACHE[key] = config
+    _CONTENT_CACHE[content_key] = config
+    return copy.deepcopy(config)
 
 def reload_config(file_path: str = "config.yaml") -> Dict[str, Any]:
     """Reload configuration from file and environment"""
-    print("🔄 Reloading configuration...")
+    logger.info("Reloading configuration...")
     
     # Clear any cached config
-    if hasattr(reload_config, '_cached_config'):
-        delattr(reload_config, '_cached_config')
+    invalidate_config_cache()
     
     # Get fresh config
     config = get_config(file_path)
     
-    print("✅ Configuration reloaded successfully")
+    logger.info("Configuration reloaded successfully")
     return config
 
 def validate_config(config: Dict[str, Any]) -> bool:
@@ -173,9 +257,9 @@ def validate_config(config: Dict[str, Any]) -> bool:
         errors.append("Leverage must be greater than 0")
     
     if errors:
-        print("❌ Configuration validation failed:")
+        logger.error("Configuration validation failed:")
         for error in errors:
-            print(f"  - {error}")
+            logger.error("  - %s", error)
         return False
     
     return True
@@ -183,11 +267,13 @@ def validate_config(config: Dict[str, Any]) -> bool:
 def save_config(config: Dict[str, Any], file_path: str = "config.yaml") -> bool:
     """Save configuration to YAML file"""
     try:
+        yaml = _get_yaml()
         with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+            yaml.dump(config, f, Dumper=_YAML_DUMPER, default_flow_style=False, allow_unicode=True)
+        invalidate_config_cache()
         return True
-    except Exception as e:
-        print(f"❌ Error saving config: {e}")
+    except Exception:
+        logger.exception("Error saving config")
         return False
 
 def create_default_config(file_path: str = "config.yaml") -> bool:
@@ -212,49 +298,9 @@ def create_default_config(file_path: str = "config.yaml") -> bool:
             'file': 'logs/trading_bot.log',
             'max_size': 10485760,  # 10MB
             'backup_count': 5
-        },
-        'trading_pair': {
-            'symbol': 'BTCUSDT',
-            'base_currency': 'BTC',
-            'quote_currency': 'USDT'
-        },
-        'position_size': {
-            'type': 'fixed',
-            'value': 10.0,
-            'max_position': 100.0
-        },
-        'leverage': {
-            'value': 1,
-            'max_leverage': 10
-        },
-        'risk_management': {
-            'stop_loss': 2.0,
-            'take_profit': 5.0,
-            'max_daily_loss': 10.0,
-            'max_open_positions': 3
-        },
-        'trading_hours': {
-            'enabled': False,
-            'start': '09:00',
-            'end': '17:00',
-            'timezone': 'UTC'
-        },
-        'watchdog': {
-            'enabled': True,
-            'heartbeat_interval': 30,
-            'max_failures': 3,
-            'auto_restart': True
-        },
-        'notifications': {
-            'enabled': False,
-            'telegram_bot_token': '',
-            'telegram_chat_id': '',
-            'email_enabled': False,
-            'email_smtp_server': '',
-            'email_username': '',
-            'email_password': ''
         }
     }
+    default_config.update(copy.deepcopy(dict(_DEFAULTS)))
     
     return save_config(default_config, file_path)
 
@@ -288,4 +334,5 @@ def main():
         print("❌ Configuration validation failed")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main() 
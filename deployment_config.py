@@ -8,75 +8,68 @@ import os
 import sys
 from pathlib import Path
 
+# Environment variable that marks each hosting platform, checked in order
+_PLATFORM_MARKERS = (
+    ('RENDER', 'render'),
+    ('HEROKU', 'heroku'),
+    ('RAILWAY', 'railway'),
+    ('DIGITALOCEAN', 'digitalocean')
+)
+
+_BASE_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 5000,
+    'debug': True,
+    'data_dir': 'data',
+    'logs_dir': 'logs',
+    'database_url': 'sqlite:///trading_bot.db'
+}
+
+# Per-platform overrides of the base config; callables so env vars are read at init
+_ENV_OVERRIDES = {
+    'render': lambda: {
+        'host': '0.0.0.0',
+        'port': int(os.environ.get('PORT', 10000)),
+        'debug': False,
+        'database_url': 'sqlite:///data/trading_bot.db'
+    },
+    'heroku': lambda: {
+        'host': '0.0.0.0',
+        'port': int(os.environ.get('PORT', 5000)),
+        'debug': False,
+        'database_url': os.environ.get('DATABASE_URL', 'sqlite:///data/trading_bot.db')
+    },
+    'railway': lambda: {
+        'host': '0.0.0.0',
+        'port': int(os.environ.get('PORT', 5000)),
+        'debug': False,
+        'database_url': os.environ.get('DATABASE_URL', 'sqlite:///data/trading_bot.db')
+    },
+    'digitalocean': lambda: {
+        'host': '0.0.0.0',
+        'port': int(os.environ.get('PORT', 5000)),
+        'debug': False,
+        'database_url': 'sqlite:///data/trading_bot.db'
+    }
+}
+
 class DeploymentConfig:
     """Configuration class for different deployment environments"""
     
+    __slots__ = ('environment', 'config')
+    
     def __init__(self):
         self.environment = self._detect_environment()
         self.config = self._get_config()
     
     def _detect_environment(self):
         """Detect the deployment environment"""
-        if os.environ.get('RENDER'):
-            return 'render'
-        elif os.environ.get('HEROKU'):
-            return 'heroku'
-        elif os.environ.get('RAILWAY'):
-            return 'railway'
-        elif os.environ.get('DIGITALOCEAN'):
-            return 'digitalocean'
-        else:
-            return 'local'
+        return next((env for var, env in _PLATFORM_MARKERS if os.environ.get(var)), 'local')
     
     def _get_config(self):
         """Get configuration based on environment"""
-        base_config = {
-            'host': '127.0.0.1',
-            'port': 5000,
-            'debug': True,
-            'data_dir': 'data',
-            'logs_dir': 'logs',
-            'database_url': 'sqlite:///trading_bot.db'
-        }
-        
-        if self.environment == 'render':
-            return {
-                'host': '0.0.0.0',
-                'port': int(os.environ.get('PORT', 10000)),
-                'debug': False,
-                'data_dir': 'data',
-                'logs_dir': 'logs',
-                'database_url': 'sqlite:///data/trading_bot.db'
-            }
-        elif self.environment == 'heroku':
-            return {
-                'host': '0.0.0.0',
-                'port': int(os.environ.get('PORT', 5000)),
-                'debug': False,
-                'data_dir': 'data',
-                'logs_dir': 'logs',
-                'database_url': os.environ.get('DATABASE_URL', 'sqlite:///data/trading_bot.db')
-            }
-        elif self.environment == 'railway':
-            return {
-                'host': '0.0.0.0',
-                'port': int(os.environ.get('PORT', 5000)),
-                'debug': False,
-                'data_dir': 'data',
-                'logs_dir': 'logs',
-                'database_url': os.environ.get('DATABASE_URL', 'sqlite:///data/trading_bot.db')
-            }
-        elif self.environment == 'digitalocean':
-            return {
-                'host': '0.0.0.0',
-                'port': int(os.environ.get('PORT', 5000)),
-                'debug': False,
-                'data_dir': 'data',
-                'logs_dir': 'logs',
-                'database_url': 'sqlite:///data/trading_bot.db'
-            }
-        else:
-            return base_config
+        overrides = _ENV_OVERRIDES.get(self.environment)
+        return {**_BASE_CONFIG, **(overrides() if overrides else {})}
     
     def setup_directories(self):
         """Create necessary directories"""
@@ -5,17 +5,70 @@ Handles communication with Pionex trading API
 """
 
 import os
+import copy
 import time
+import functools
+import logging
 import hmac
 import hashlib
-import requests
 import json
 from typing import Dict, Any, Optional, List
-from urllib.parse import urlencode
+from urllib.parse import urlencode, quote_plus
+
+logger = logging.getLogger(__name__)
+
+# requests (and urllib3/certifi with it) is imported on first client creation
+_requests = None
+
+def _get_requests():
+    """Import requests once and cache the module"""
+    global _requests
+    if _requests is None:
+        import requests as _requests_mod
+        _requests = _requests_mod
+    return _requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both decoders accept raw bytes and raise json.JSONDecodeError subclasses
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _encode_body(data: Optional[Dict]) -> bytes:
+    """Serialize a request body once into canonical JSON bytes"""
+    if not data:
+        return b''
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+@functools.lru_cache(maxsize=64)
+def _endpoint_key(method: str, path: str) -> bytes:
+    """Encoded method+path part of the string to sign"""
+    return f"{method}{path}".encode('utf-8')
+
+@functools.lru_cache(maxsize=64)
+def _join_url(base_url: str, endpoint: str) -> str:
+    """Full URL for an endpoint; endpoints are constant strings"""
+    return f"{base_url}{endpoint}"
+
+# Cache lifetimes (seconds) for read-only GET endpoints that rarely change
+_CACHE_TTLS = {
+    '/api/v1/market/symbols': 3600,
+    '/api/v1/market/exchangeInfo': 3600,
+    '/api/v1/time': 1
+}
+
+# Query values such as symbols repeat across calls; quote_plus matches urlencode
+_quote = functools.lru_cache(maxsize=256)(quote_plus)
 
 class PionexAPI:
     """Pionex API client for trading operations"""
     
+    __slots__ = ('api_key', 'secret_key', 'base_url', '_session', '_hmac_template', '_cache', '_verbs')
+    
     def __init__(self, api_key: str = None, secret_key: str = None, base_url: str = None):
         """Initialize API client"""
         self.api_key = api_key or os.getenv('PIONEX_API_KEY', '')
@@ -24,59 +77,117 @@ class PionexAPI:
         
         if not self.api_key or not self.secret_key:
             raise ValueError("API key and secret key are required")
+        
+        # Keyed HMAC state, copied per signature instead of re-deriving the key
+        self._hmac_template = hmac.new(self.secret_key.encode('utf-8'), b'', hashlib.sha256)
+        
+        requests = _get_requests()
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Reuse one pooled, keep-alive session for all requests
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Content-Type': 'application/json',
+            'X-PIONEX-API-KEY': self.api_key
+        })
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('https://', adapter)
+        
+        # Bound session methods by HTTP verb; callers pass uppercase constants
+        self._verbs = {
+            'GET': self._session.get,
+            'POST': self._session.post,
+            'DELETE': self._session.delete
+        }
+        
+        # endpoint -> (expiry, payload, conditional request headers)
+        self._cache: Dict[str, tuple] = {}
+    
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
     
-    def _generate_signature(self, timestamp: str, method: str, path: str, params: Dict = None, body: Dict = None) -> str:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _generate_signature(self, timestamp: str, method: str, path: str, params: Dict = None, body: bytes = b'') -> str:
         """Generate HMAC signature for API requests"""
-        # Create string to sign
-        string_to_sign = f"{timestamp}{method}{path}"
+        # Feed the string to sign in pieces: timestamp, method+path, query, body
+        mac = self._hmac_template.copy()
+        mac.update(timestamp.encode('utf-8'))
+        mac.update(_endpoint_key(method, path))
         
         if params:
-            sorted_params = sorted(params.items())
-            query_string = urlencode(sorted_params)
-            string_to_sign += f"?{query_string}"
+            if len(params) == 1:
+                (key, value), = params.items()
+                query_string = f"{_quote(str(key))}={_quote(str(value))}"
+            else:
+                query_string = urlencode(sorted(params.items()))
+            mac.update(f"?{query_string}".encode('utf-8'))
         
         if body:
-            string_to_sign += json.dumps(body)
+            # Sign the exact bytes that go on the wire
+            mac.update(body)
         
-        # Generate HMAC signature
-        signature = hmac.new(
-            self.secret_key.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return signature
+        return mac.hexdigest()
     
     def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict[str, Any]:
         """Make API request with authentication"""
-        url = f"{self.base_url}{endpoint}"
+        ttl = _CACHE_TTLS.get(endpoint) if method == 'GET' and not params else None
+        cached = self._cache.get(endpoint) if ttl is not None else None
+        if cached is not None and time.monotonic() < cached[0]:
+            return copy.deepcopy(cached[1])
+        
+        url = _join_url(self.base_url, endpoint)
         timestamp = str(int(time.time() * 1000))
         
+        body = _encode_body(data)
+        
         # Generate signature
-        signature = self._generate_signature(timestamp, method, endpoint, params, data)
+        signature = self._generate_signature(timestamp, method, endpoint, params, body)
         
-        # Prepare headers
+        # Only the per-request headers; static ones live on the session
         headers = {
-            'Content-Type': 'application/json',
-            'X-PIONEX-API-KEY': self.api_key,
             'X-PIONEX-TIMESTAMP': timestamp,
             'X-PIONEX-SIGNATURE': signature
         }
+        if cached is not None:
+            # Revalidate the expired entry instead of refetching the payload
+            headers.update(cached[2])
         
         try:
-            if method.upper() == 'GET':
-                response = requests.get(url, params=params, headers=headers, timeout=10)
-            elif method.upper() == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, params=params, headers=headers, timeout=10)
-            else:
+            verb = self._verbs.get(method)
+            if verb is None:
                 raise ValueError(f"Unsupported HTTP method: {method}")
+            response = verb(url, params=params, data=body, headers=headers, timeout=10)
             
             response.raise_for_status()
-            return response.json()
             
-        except requests.exceptions.RequestException as e:
+            if cached is not None and response.status_code == 304:
+                self._cache[endpoint] = (time.monotonic() + ttl, cached[1], cached[2])
+                return copy.deepcopy(cached[1])
+            
+            result = _json_loads(response.content)
+            # Only cache successful payloads (Pionex reports failures as result=false)
+            if ttl is not None and not (isinstance(result, dict) and result.get('result') is False):
+                validators = {}
+                if response.headers.get('ETag'):
+                    validators['If-None-Match'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    validators['If-Modified-Since'] = response.headers['Last-Modified']
+                self._cache[endpoint] = (time.monotonic() + ttl, result, validators)
+                return copy.deepcopy(result)
+            return result
+            
+        except _get_requests().exceptions.RequestException as e:
             return {'error': f"Request failed: {str(e)}"}
         except json.JSONDecodeError as e:
             return {'error': f"Invalid JSON response: {str(e)}"}
@@ -166,14 +277,14 @@ def test_api_connection():
         result = api.test_connection()
         
         if 'error' in result:
-            print(f"❌ API connection failed: {result['error']}")
+            logger.error("API connection failed: %s", result['error'])
             return False
         else:
-            print("✅ API connection successful")
+            logger.info("API connection successful")
             return True
             
-    except Exception as e:
-        print(f"❌ API connection error: {e}")
+    except Exception:
+        logger.exception("API connection error")
         return False
 
 def main():
@@ -186,4 +297,5 @@ def main():
         print("❌ API test failed")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main() 
\ No newline at end of file
@@ -5,34 +5,25 @@ Test script for Pionex Trading Bot modules
 
 import sys
 import os
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 
 def test_imports():
     """Test all module imports"""
     print("🔧 Testing module imports...")
     
-    # Test config_loader
-    try:
-        from config_loader import get_config, create_default_config
-        print("✅ config_loader imported successfully")
-    except Exception as e:
-        print(f"❌ config_loader import failed: {e}")
-        return False
-    
-    # Test pionex_api
-    try:
-        from pionex_api import PionexAPI
-        print("✅ pionex_api imported successfully")
-    except Exception as e:
-        print(f"❌ pionex_api import failed: {e}")
-        return False
+    # Import concurrently so file I/O of the transitive imports overlaps
+    modules = ['config_loader', 'pionex_api', 'watchdog']
+    with ThreadPoolExecutor(max_workers=len(modules)) as executor:
+        futures = [executor.submit(importlib.import_module, name) for name in modules]
     
-    # Test watchdog
-    try:
-        from watchdog import start_watchdog, stop_watchdog, get_watchdog_status
-        print("✅ watchdog imported successfully")
-    except Exception as e:
-        print(f"❌ watchdog import failed: {e}")
-        return False
+    for name, future in zip(modules, futures):
+        try:
+            future.result()
+            print(f"✅ {name} imported successfully")
+        except Exception as e:
+            print(f"❌ {name} import failed: {e}")
+            return False
     
     return True
 
@@ -4,16 +4,49 @@ Watchdog System for Pionex Trading Bot
 Monitors system health and automatically restarts if needed
 """
 
+import io
 import os
+import sys
+import signal
+import json
 import time
+import functools
 import threading
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Heartbeat clock: CLOCK_MONOTONIC_COARSE (Linux) is a cheap cached read with
+# ~1-4 ms resolution, plenty for a watchdog measured in seconds
+_COARSE = getattr(time, 'CLOCK_MONOTONIC_COARSE', None)
+_get_ns = functools.partial(time.clock_gettime_ns, _COARSE) if _COARSE is not None else time.monotonic_ns
+
+# Restart log entries have a fixed schema; fill the line in directly
+_RESTART_LOG_LINE = b'{"timestamp":"%s","reason":"watchdog_max_failures","failure_count":%d,"last_heartbeat":%s}\n'
+
+def _dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 class Watchdog:
     """Watchdog system for monitoring and auto-restart"""
     
+    __slots__ = ('config', 'enabled', 'heartbeat_interval', 'max_failures', 'auto_restart',
+                 '_status_static', 'failure_count', '_last_hb_ns', '_iso_cache', '_hb_seq',
+                 '_min_hb_interval_ns', '_run_event', 'thread', '_use_signal_timer',
+                 '_prev_sigalrm_handler', '_stop_event', '_restart_log_fp', 'logger')
+    
     def __init__(self, config: Dict[str, Any] = None):
         """Initialize watchdog"""
         self.config = config or {}
@@ -22,11 +55,32 @@ class Watchdog:
         self.max_failures = self.config.get('max_failures', 3)
         self.auto_restart = self.config.get('auto_restart', True)
         
+        # Status fields that never change after init
+        self._status_static = {
+            'enabled': self.enabled,
+            'max_failures': self.max_failures,
+            'auto_restart': self.auto_restart,
+            'heartbeat_interval': self.heartbeat_interval
+        }
+        
         self.failure_count = 0
-        self.last_heartbeat = None
-        self.is_running = False
+        self._last_hb_ns = 0  # _get_ns() of last heartbeat, 0 = none yet
+        self._iso_cache = (0, None)  # (_last_hb_ns, its ISO string)
+        self._hb_seq = 0  # bumped by every heartbeat; only ever written by heartbeat()
+        # Heartbeats closer together than a quarter interval can't be observed apart
+        self._min_hb_interval_ns = max(1, int(self.heartbeat_interval * 250_000_000))
+        self._run_event = threading.Event()
         self.thread = None
-        self.logger = logging.getLogger(__name__)
+        self._use_signal_timer = False
+        self._prev_sigalrm_handler = None
+        self._stop_event = threading.Event()
+        self._restart_log_fp = None
+        self.logger = logger
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the monitor has been started and not stopped"""
+        return self._run_event.is_set()
     
     def start(self) -> bool:
         """Start the watchdog"""
@@ -39,14 +93,24 @@ class Watchdog:
             return True
         
         try:
-            self.is_running = True
-            self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-            self.thread.start()
+            self._run_event.set()
+            self._stop_event.clear()
+            # SIGALRM handlers can only be installed from the main thread
+            self._use_signal_timer = (
+                self.config.get('signal_timer', False)
+                and hasattr(signal, 'setitimer')
+                and threading.current_thread() is threading.main_thread()
+            )
+            if self._use_signal_timer:
+                self._start_signal_timer()
+            else:
+                self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
+                self.thread.start()
             self.logger.info("Watchdog started successfully")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to start watchdog: {e}")
-            self.is_running = False
+            self.logger.error("Failed to start watchdog: %s", e)
+            self._run_event.clear()
             return False
     
     def stop(self) -> bool:
@@ -55,68 +119,117 @@ class Watchdog:
             return True
         
         try:
-            self.is_running = False
+            self._run_event.clear()
+            self._stop_event.set()
+            if self._use_signal_timer:
+                self._stop_signal_timer()
             if self.thread and self.thread.is_alive():
                 self.thread.join(timeout=5)
+            if self._restart_log_fp is not None:
+                self._restart_log_fp.close()
+                self._restart_log_fp = None
             self.logger.info("Watchdog stopped")
             return True
         except Exception as e:
-            self.logger.error(f"Error stopping watchdog: {e}")
+            self.logger.error("Error stopping watchdog: %s", e)
             return False
     
     def heartbeat(self) -> bool:
         """Send heartbeat signal"""
-        try:
-            self.last_heartbeat = datetime.now()
-            self.failure_count = 0
-            self.logger.debug("Heartbeat sent")
+        now = _get_ns()
+        if now - self._last_hb_ns < self._min_hb_interval_ns:
             return True
-        except Exception as e:
-            self.logger.error(f"Heartbeat failed: {e}")
-            return False
+        self._last_hb_ns = now
+        self._hb_seq += 1
+        self.failure_count = 0
+        return True
+    
+    def _make_check(self):
+        """Build the per-interval liveness check; it returns False once monitoring should end"""
+        max_failures = self.max_failures
+        log = self.logger
+        last_seq = self._hb_seq
+        stale_checks = 0
+        
+        def check() -> bool:
+            nonlocal last_seq, stale_checks
+            # An unchanged sequence number means no heartbeat since the last check
+            cur_seq = self._hb_seq
+            if cur_seq != last_seq:
+                last_seq = cur_seq
+                stale_checks = 0
+            elif cur_seq != 0:
+                stale_checks += 1
+                # Two silent intervals, as with the old 2x heartbeat_interval timeout
+                if stale_checks >= 2:
+                    failures = self.failure_count + 1
+                    self.failure_count = failures
+                    log.warning("Heartbeat timeout. Failure count: %d", failures)
+                    
+                    if failures >= max_failures:
+                        log.error("Maximum failures reached. Triggering restart...")
+                        if self.auto_restart:
+                            self._trigger_restart()
+                        return False
+            return True
+        
+        return check
     
     def _monitor_loop(self):
         """Main monitoring loop"""
-        self.logger.info("Watchdog monitoring loop started")
+        # Invariant for the lifetime of the loop; keep them in locals
+        interval = self.heartbeat_interval
+        log = self.logger
+        running = self._run_event.is_set
+        wait = self._stop_event.wait
+        check = self._make_check()
+        
+        log.info("Watchdog monitoring loop started")
         
-        while self.is_running:
+        while running():
             try:
-                # Check if heartbeat is too old
-                if self.last_heartbeat:
-                    time_since_heartbeat = datetime.now() - self.last_heartbeat
-                    max_allowed_time = timedelta(seconds=self.heartbeat_interval * 2)
-                    
-                    if time_since_heartbeat > max_allowed_time:
-                        self.failure_count += 1
-                        self.logger.warning(f"Heartbeat timeout. Failure count: {self.failure_count}")
-                        
-                        if self.failure_count >= self.max_failures:
-                            self.logger.error("Maximum failures reached. Triggering restart...")
-                            if self.auto_restart:
-                                self._trigger_restart()
-                            break
+                if not check():
+                    break
                 
-                time.sleep(self.heartbeat_interval)
+                # Unlike time.sleep(), wakes immediately when stop() is called. Both
+                # sides live in this process, so an eventfd + select() wake-up would
+                # add an fd to manage without waking any sooner.
+                if wait(interval):
+                    break
                 
             except Exception as e:
-                self.logger.error(f"Error in watchdog loop: {e}")
-                time.sleep(self.heartbeat_interval)
+                log.error("Error in watchdog loop: %s", e)
+                if wait(interval):
+                    break
+    
+    def _start_signal_timer(self):
+        """Run the liveness check from a SIGALRM interval timer instead of a thread"""
+        check = self._make_check()
+        
+        def on_alarm(signum, frame):
+            try:
+                if not check():
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            except Exception as e:
+                self.logger.error("Error in watchdog loop: %s", e)
+        
+        self._prev_sigalrm_handler = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, self.heartbeat_interval, self.heartbeat_interval)
+        self.logger.info("Watchdog monitoring via SIGALRM timer")
+    
+    def _stop_signal_timer(self):
+        """Disarm the SIGALRM timer and restore the previous handler"""
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGALRM, self._prev_sigalrm_handler or signal.SIG_DFL)
     
     def _trigger_restart(self):
         """Trigger system restart"""
         try:
             self.logger.critical("Watchdog triggering system restart")
             
-            # Log restart event
-            restart_log = {
-                'timestamp': datetime.now().isoformat(),
-                'reason': 'watchdog_max_failures',
-                'failure_count': self.failure_count,
-                'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None
-            }
-            
             # Save restart log
-            self._save_restart_log(restart_log)
+            self._save_restart_log(datetime.now().isoformat(), self.failure_count, self._last_hb_iso())
             
             # In a real implementation, you might:
             # 1. Send notification
@@ -127,93 +240,132 @@ class Watchdog:
             self.logger.info("Restart triggered successfully")
             
         except Exception as e:
-            self.logger.error(f"Error triggering restart: {e}")
+            self.logger.error("Error triggering restart: %s", e)
     
-    def _save_restart_log(self, log_data: Dict[str, Any]):
+    def _save_restart_log(self, ts_iso: str, failure_count: int, last_hb_iso: Optional[str]):
         """Save restart log to file"""
         try:
-            log_dir = Path('logs')
-            log_dir.mkdir(exist_ok=True)
+            # Opened once, unbuffered so each line is a single write; closed in stop()
+            if self._restart_log_fp is None:
+                log_dir = Path('logs')
+                log_dir.mkdir(exist_ok=True)
+                self._restart_log_fp = open(log_dir / 'watchdog_restarts.log', 'ab', buffering=0)
             
-            log_file = log_dir / 'watchdog_restarts.log'
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f"{json.dumps(log_data)}\n")
+            self._restart_log_fp.write(_RESTART_LOG_LINE % (ts_iso.encode('ascii'), failure_count, _dumps(last_hb_iso)))
                 
         except Exception as e:
-            self.logger.error(f"Error saving restart log: {e}")
+            self.logger.error("Error saving restart log: %s", e)
+    
+    def _last_hb_iso(self) -> Optional[str]:
+        """Wall-clock ISO timestamp of the last heartbeat"""
+        ns = self._last_hb_ns
+        cached = self._iso_cache
+        if cached[0] == ns:
+            return cached[1]
+        
+        iso = None
+        if ns:
+            wall_ns = time.time_ns() - (_get_ns() - ns)
+            iso = datetime.fromtimestamp(wall_ns / 1e9).isoformat()
+        self._iso_cache = (ns, iso)
+        return iso
     
     def get_status(self) -> Dict[str, Any]:
         """Get watchdog status"""
         return {
-            'enabled': self.enabled,
+            **self._status_static,
             'running': self.is_running,
             'failure_count': self.failure_count,
-            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None,
-            'max_failures': self.max_failures,
-            'auto_restart': self.auto_restart,
-            'heartbeat_interval': self.heartbeat_interval
+            'last_heartbeat': self._last_hb_iso()
         }
 
 # Global watchdog instance
 _watchdog_instance = None
+_watchdog_init_lock = threading.Lock()
+
+# Reported when no watchdog has been started; read-only and shared
+_DEFAULT_STATUS = MappingProxyType({
+    'enabled': False,
+    'running': False,
+    'failure_count': 0,
+    'last_heartbeat': None,
+    'max_failures': 3,
+    'auto_restart': True,
+    'heartbeat_interval': 30
+})
 
 def start_watchdog(config: Dict[str, Any] = None) -> Optional[Watchdog]:
     """Start the global watchdog instance"""
-    global _watchdog_instance
+    global _watchdog_instance, send_heartbeat
     
     try:
-        if _watchdog_instance and _watchdog_instance.is_running:
-            return _watchdog_instance
+        wd = _watchdog_instance
+        if wd and wd.is_running:
+            return wd
         
-        _watchdog_instance = Watchdog(config)
-        if _watchdog_instance.start():
-            return _watchdog_instance
-        else:
-            return None
+        # Double-checked so concurrent callers can't each start a monitor thread
+        with _watchdog_init_lock:
+            wd = _watchdog_instance
+            if wd and wd.is_running:
+                return wd
+            
+            wd = _watchdog_instance = Watchdog(config)
+            if wd.start():
+                # Skip the global instance lookup on every heartbeat until stopped
+                send_heartbeat = _make_fast_heartbeat(wd)
+                return wd
+            else:
+                return None
     except Exception as e:
-        logging.error(f"Failed to start watchdog: {e}")
+        logger.error("Failed to start watchdog: %s", e)
         return None
 
 def stop_watchdog() -> bool:
     """Stop the global watchdog instance"""
-    global _watchdog_instance
+    global _watchdog_instance, send_heartbeat
     
     try:
+        send_heartbeat = _send_heartbeat_default
         if _watchdog_instance:
             return _watchdog_instance.stop()
         return True
     except Exception as e:
-        logging.error(f"Failed to stop watchdog: {e}")
+        logger.error("Failed to stop watchdog: %s", e)
         return False
 
-def get_watchdog_status() -> Dict[str, Any]:
+def get_watchdog_status() -> Mapping[str, Any]:
     """Get status of the global watchdog instance"""
     global _watchdog_instance
     
     if _watchdog_instance:
         return _watchdog_instance.get_status()
     else:
-        return {
-            'enabled': False,
-            'running': False,
-            'failure_count': 0,
-            'last_heartbeat': None,
-            'max_failures': 3,
-            'auto_restart': True,
-            'heartbeat_interval': 30
-        }
+        return _DEFAULT_STATUS
 
 def send_heartbeat() -> bool:
     """Send heartbeat to the global watchdog instance"""
-    global _watchdog_instance
+    wd = _watchdog_instance
+    return wd is not None and wd._run_event.is_set() and wd.heartbeat()
+
+_send_heartbeat_default = send_heartbeat
+
+def _make_fast_heartbeat(watchdog: Watchdog):
+    """Build a send_heartbeat() bound directly to a started watchdog"""
+    heartbeat = watchdog.heartbeat
+    run_event = watchdog._run_event
+    
+    def fast_send_heartbeat() -> bool:
+        """Send heartbeat to the global watchdog instance"""
+        return run_event.is_set() and heartbeat()
     
-    if _watchdog_instance and _watchdog_instance.is_running:
-        return _watchdog_instance.heartbeat()
-    return False
+    return fast_send_heartbeat
 
 def main():
     """Test watchdog functionality"""
-    print("🔧 Testing watchdog system...")
+    # Collect the report and write it to stdout in one go
+    buf = io.StringIO()
+    w = buf.write
+    w("🔧 Testing watchdog system...\n")
     
     # Test configuration
     config = {
@@ -223,32 +375,34 @@ def main():
         'auto_restart': True
     }
     
-    # Start watchdog
-    watchdog = start_watchdog(config)
-    if watchdog:
-        print("✅ Watchdog started")
-        
-        # Send heartbeats
-        for i in range(3):
-            time.sleep(2)
-            if send_heartbeat():
-                print(f"✅ Heartbeat {i+1} sent")
+    try:
+        # Start watchdog
+        watchdog = start_watchdog(config)
+        if watchdog:
+            w("✅ Watchdog started\n")
+            
+            # Send heartbeats
+            for i in range(3):
+                time.sleep(2)
+                if send_heartbeat():
+                    w(f"✅ Heartbeat {i+1} sent\n")
+                else:
+                    w(f"❌ Heartbeat {i+1} failed\n")
+            
+            # Get status
+            status = get_watchdog_status()
+            w(f"📊 Status: {status}\n")
+            
+            # Stop watchdog
+            if stop_watchdog():
+                w("✅ Watchdog stopped\n")
             else:
-                print(f"❌ Heartbeat {i+1} failed")
-        
-        # Get status
-        status = get_watchdog_status()
-        print(f"📊 Status: {status}")
-        
-        # Stop watchdog
-        if stop_watchdog():
-            print("✅ Watchdog stopped")
+                w("❌ Failed to stop watchdog\n")
         else:
-            print("❌ Failed to stop watchdog")
-    else:
-        print("❌ Failed to start watchdog")
+            w("❌ Failed to start watchdog\n")
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
 if __name__ == "__main__":
-    import json
-    from pathlib import Path
     main() 
\ No newline at end of file